@@ -146,6 +146,26 @@ def TestIfImage(img):
         return False
 
 
+def render_image_variations_async(file_name, variations, storage) -> bool:
+    """Render image variations (thumbnails) via the background worker.
+
+    This function is intended as the 'render_variations' callback for a
+    StdImageField. Rendering the variations is CPU-bound (PIL resize),
+    so it is offloaded to the background worker rather than blocking the
+    uploading HTTP request.
+
+    Returns:
+        bool: Always False, to prevent stdimage from rendering inline
+    """
+    import InvenTree.tasks
+
+    InvenTree.tasks.offload_task(
+        'stdimage.utils.render_variations', file_name, variations, replace=True
+    )
+
+    return False
+
+
 def getBlankImage():
     """Return the qualified path for the 'blank image' placeholder."""
     return getStaticUrl('img/blank_image.png')
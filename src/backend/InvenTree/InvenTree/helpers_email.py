@@ -50,10 +50,36 @@ def is_email_configured():
     return configured
 
 
+def send_mail_individually(subject, body, from_email, recipients, html_message=None):
+    """Send an individual copy of an email message to each recipient.
+
+    A single SMTP connection is reused for the entire batch, and each
+    recipient receives their own copy of the message - so recipient
+    addresses are not exposed to each other (as they would be with a
+    single multi-recipient message).
+    """
+    messages = []
+
+    for recipient in recipients:
+        msg = django_mail.EmailMultiAlternatives(
+            subject=subject, body=body, from_email=from_email, to=[recipient]
+        )
+
+        if html_message:
+            msg.attach_alternative(html_message, 'text/html')
+
+        messages.append(msg)
+
+    # Open a single connection for the whole batch
+    connection = django_mail.get_connection(fail_silently=False)
+
+    return connection.send_messages(messages)
+
+
 def send_email(subject, body, recipients, from_email=None, html_message=None):
     """Send an email with the specified subject and body, to the specified recipients list."""
-    if isinstance(recipients, str):
-        recipients = [recipients]
+    # Evaluate any queryset / generator before the task is serialized
+    recipients = [recipients] if isinstance(recipients, str) else list(recipients)
 
     import InvenTree.ready
     import InvenTree.status
@@ -78,13 +104,15 @@ def send_email(subject, body, recipients, from_email=None, html_message=None):
                 logger.error('send_email failed: DEFAULT_FROM_EMAIL not specified')
                 return
 
+    # Offload the entire batch as a single task,
+    # with each recipient receiving an individual copy of the message
     InvenTree.tasks.offload_task(
-        django_mail.send_mail,
+        send_mail_individually,
         subject,
         body,
         from_email,
         recipients,
-        fail_silently=False,
         html_message=html_message,
         group='notification',
+        cluster='io',
     )
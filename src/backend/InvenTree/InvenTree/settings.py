@@ -885,6 +885,15 @@ BACKGROUND_WORKER_COUNT = (
     else 1
 )
 
+# Number of workers for the (optional) dedicated 'io' cluster.
+# I/O bound tasks (e.g. email delivery) spend most of their time waiting on
+# sockets, and benefit from higher concurrency than database-bound tasks.
+# If set, such tasks are routed to a separate queue, which must be serviced
+# by an additional worker process started with: Q_CLUSTER_NAME=io
+BACKGROUND_IO_WORKER_COUNT = int(
+    get_setting('INVENTREE_BACKGROUND_IO_WORKERS', 'background.io_workers', 0)
+)
+
 # django-q background worker configuration
 Q_CLUSTER = {
     'name': 'InvenTree',
@@ -904,6 +913,9 @@ Q_CLUSTER = {
     'poll': 1.5,
 }
 
+if BACKGROUND_IO_WORKER_COUNT > 0:
+    Q_CLUSTER['ALT_CLUSTERS'] = {'io': {'workers': BACKGROUND_IO_WORKER_COUNT}}
+
 # Configure django-q sentry integration
 if SENTRY_ENABLED and SENTRY_DSN:
     Q_CLUSTER['error_reporter'] = {'sentry': {'dsn': SENTRY_DSN}}
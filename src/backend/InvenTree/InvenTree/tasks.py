@@ -1,20 +1,20 @@
 """Functions for tasks and a few general async tasks."""
 
-import json
 import os
 import random
-import re
 import time
 import warnings
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Callable, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import AppRegistryNotReady
 from django.core.management import call_command
-from django.db import DEFAULT_DB_ALIAS, connections
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
 from django.db.migrations.executor import MigrationExecutor
 from django.db.utils import NotSupportedError, OperationalError, ProgrammingError
 from django.utils import timezone
@@ -35,6 +35,70 @@ from .version import isInvenTreeUpToDate
 
 logger = structlog.get_logger('inventree')
 
+# Shared session for GitHub API requests - reuses the TCP/TLS connection
+# between update checks instead of performing a fresh handshake each time
+_github_session = requests.Session()
+_github_session.headers.update(
+    {'Accept': 'application/vnd.github+json', 'User-Agent': 'InvenTree'}
+)
+
+# Cache of task functions resolved from their dotted path,
+# so repeated synchronous invocations skip the import machinery
+_task_cache: dict[str, Callable] = {}
+
+# Cached background worker status (timestamp, value)
+_worker_status = {'ts': None, 'running': False}
+
+
+def _is_worker_running_cached(ttl: int = 30) -> bool:
+    """Return the (cached) status of the background worker.
+
+    Checking the worker status requires a database query against the
+    django_q result tables; offload_task may be called many times in
+    quick succession (e.g. bursts of notifications), so the result is
+    cached for a short period.
+
+    Arguments:
+        ttl (int): Number of seconds for which a cached result is valid
+    """
+    from InvenTree.status import is_worker_running
+
+    now = time.monotonic()
+
+    if _worker_status['ts'] is None or now - _worker_status['ts'] > ttl:
+        _worker_status['ts'] = now
+        _worker_status['running'] = is_worker_running()
+
+    return _worker_status['running']
+
+
+def _resolve_cluster(cluster: Optional[str]) -> Optional[str]:
+    """Map a requested cluster name to a *configured* alternate cluster.
+
+    Tasks are only routed to a named cluster if it is actually configured
+    (via the ALT_CLUSTERS entry in the Q_CLUSTER setting) - otherwise they
+    fall back to the default cluster, so they are never left unserviced.
+    """
+    if cluster and cluster in settings.Q_CLUSTER.get('ALT_CLUSTERS', {}):
+        return cluster
+
+    return None
+
+
+@lru_cache(maxsize=1)
+def _q_models():
+    """Return the django_q models module.
+
+    The import must be deferred (django_q models cannot be imported until
+    the app registry is ready), but the result is cached so each task
+    invocation does not repeat the import dance. If the import fails
+    (e.g. AppRegistryNotReady), nothing is cached and it is retried on
+    the next call.
+    """
+    from django_q import models
+
+    return models
+
 
 def schedule_task(taskname, **kwargs):
     """Create a scheduled task.
@@ -46,27 +110,65 @@ def schedule_task(taskname, **kwargs):
     kwargs['repeats'] = repeats
 
     try:
-        from django_q.models import Schedule
+        Schedule = _q_models().Schedule
     except AppRegistryNotReady:  # pragma: no cover
         logger.info('Could not start background tasks - App registry not ready')
         return
 
     try:
-        # If this task is already scheduled, don't schedule it again
-        # Instead, update the scheduling parameters
-        if Schedule.objects.filter(func=taskname).exists():
-            logger.debug("Scheduled task '%s' already exists - updating!", taskname)
+        # If this task is already scheduled, update the scheduling parameters
+        # Note: A single upsert, rather than a separate exists() check + update
+        _, created = Schedule.objects.update_or_create(
+            func=taskname, defaults={'name': taskname, **kwargs}
+        )
 
-            Schedule.objects.filter(func=taskname).update(**kwargs)
+        if created:
+            logger.info("Created scheduled task '%s'", taskname)
         else:
-            logger.info("Creating scheduled task '%s'", taskname)
-
-            Schedule.objects.create(name=taskname, func=taskname, **kwargs)
+            logger.debug("Scheduled task '%s' already exists - updating!", taskname)
     except (OperationalError, ProgrammingError):  # pragma: no cover
         # Required if the DB is not ready yet
         pass
 
 
+def _batched_delete(queryset, batch_size: int = 1000) -> int:
+    """Delete the contents of a queryset in fixed-size batches.
+
+    A single unbounded DELETE against a very large table can hold locks
+    (and grow the transaction log) for a long time - deleting in small
+    chunks keeps each transaction short and bounded.
+
+    Note that each batch is deleted with QuerySet._raw_delete,
+    which issues a single DELETE statement without instantiating model
+    objects, collecting cascades, or dispatching pre_delete / post_delete
+    signals. Only use this helper for models with no FK cascades and no
+    delete signal handlers attached.
+
+    Arguments:
+        queryset: The queryset whose rows are to be deleted
+        batch_size (int): Maximum number of rows to delete per statement
+
+    Returns:
+        int: Total number of rows deleted
+    """
+    model = queryset.model
+    total = 0
+
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+
+        if not pks:
+            break
+
+        # Each batch commits independently,
+        # so earlier batches are retained even if a later one fails
+        with transaction.atomic():
+            batch = model.objects.filter(pk__in=pks)
+            total += batch._raw_delete(batch.db)
+
+    return total
+
+
 def raise_warning(msg):
     """Log and raise a warning."""
     logger.warning(msg)
@@ -170,6 +272,10 @@ def offload_task(
 
     If workers are not running or force_sync flag, is set then the task is ran synchronously.
 
+    A 'cluster' kwarg may be provided to route the task to a dedicated
+    worker cluster (e.g. 'io' for I/O bound tasks such as email delivery).
+    Routing only applies if that cluster is configured - see ALT_CLUSTERS.
+
     Returns:
         bool: True if the task was offloaded (or ran), False otherwise
     """
@@ -178,12 +284,17 @@ def offload_task(
     # Extract group information from kwargs
     group = kwargs.pop('group', 'inventree')
 
+    # Extract (optional) cluster routing information from kwargs
+    cluster = _resolve_cluster(kwargs.pop('cluster', None))
+
+    worker_running = False
+
     try:
         import importlib
 
         from django_q.tasks import AsyncTask
 
-        from InvenTree.status import is_worker_running
+        worker_running = _is_worker_running_cached()
     except AppRegistryNotReady:  # pragma: no cover
         logger.warning("Could not offload task '%s' - app registry not ready", taskname)
 
@@ -201,10 +312,10 @@ def offload_task(
         else:
             force_sync = True
 
-    if force_async or (is_worker_running() and not force_sync):
+    if force_async or (worker_running and not force_sync):
         # Running as asynchronous task
         try:
-            task = AsyncTask(taskname, *args, group=group, **kwargs)
+            task = AsyncTask(taskname, *args, group=group, cluster=cluster, **kwargs)
             task.run()
         except ImportError:
             raise_warning(f"WARNING: '{taskname}' not offloaded - Function not found")
@@ -217,6 +328,9 @@ def offload_task(
         if callable(taskname):
             # function was passed - use that
             _func = taskname
+        elif taskname in _task_cache:
+            # Function has already been resolved - skip the import machinery
+            _func = _task_cache[taskname]
         else:
             # Split path
             try:
@@ -239,22 +353,17 @@ def offload_task(
                 return False
 
             # Retrieve function
-            try:
-                _func = getattr(_mod, func)
-            except AttributeError:  # pragma: no cover
-                # getattr does not work for local import
-                _func = None
+            _func = getattr(_mod, func, None)
 
-            try:
-                if not _func:
-                    _func = eval(func)  # pragma: no cover
-            except NameError:
+            if _func is None:
                 log_error('InvenTree.offload_task')
                 raise_warning(
                     f"WARNING: '{taskname}' not started - No function named '{func}'"
                 )
                 return False
 
+            _task_cache[taskname] = _func
+
         # Workers are not running: run it as synchronous task
         try:
             _func(*args, **kwargs)
@@ -351,20 +460,15 @@ def heartbeat():
     (There is probably a less "hacky" way of achieving this)?
     """
     try:
-        from django_q.models import OrmQ, Success
+        OrmQ = _q_models().OrmQ
     except AppRegistryNotReady:  # pragma: no cover
         logger.info('Could not perform heartbeat task - App registry not ready')
         return
 
-    threshold = timezone.now() - timedelta(minutes=30)
+    logger.debug('InvenTree heartbeat')
 
-    # Delete heartbeat results more than half an hour old,
-    # otherwise they just create extra noise
-    heartbeats = Success.objects.filter(
-        func='InvenTree.tasks.heartbeat', started__lte=threshold
-    )
-
-    heartbeats.delete()
+    # Note: Stale heartbeat results are pruned by 'delete_successful_tasks',
+    # so the only work left here is to clear out any *queued* duplicates
 
     # Clear out any other pending heartbeat tasks
     for task in OrmQ.objects.all():
@@ -376,7 +480,7 @@ def heartbeat():
 def delete_successful_tasks():
     """Delete successful task logs which are older than a specified period."""
     try:
-        from django_q.models import Success
+        Success = _q_models().Success
 
         days = get_global_setting('INVENTREE_DELETE_TASKS_DAYS', 30)
         threshold = timezone.now() - timedelta(days=days)
@@ -384,9 +488,22 @@ def delete_successful_tasks():
         # Delete successful tasks
         results = Success.objects.filter(started__lte=threshold)
 
-        if results.count() > 0:
-            logger.info('Deleting %s successful task records', results.count())
-            results.delete()
+        n = _batched_delete(results)
+
+        if n:
+            logger.info('Deleted %s successful task records', n)
+
+        # Heartbeat results are recorded every few minutes,
+        # and only need to be retained long enough for the worker healthcheck
+        heartbeats = Success.objects.filter(
+            func='InvenTree.tasks.heartbeat',
+            started__lte=timezone.now() - timedelta(hours=1),
+        )
+
+        n = _batched_delete(heartbeats)
+
+        if n:
+            logger.info('Deleted %s old heartbeat records', n)
 
     except AppRegistryNotReady:  # pragma: no cover
         logger.info(
@@ -398,7 +515,7 @@ def delete_successful_tasks():
 def delete_failed_tasks():
     """Delete failed task logs which are older than a specified period."""
     try:
-        from django_q.models import Failure
+        Failure = _q_models().Failure
 
         days = get_global_setting('INVENTREE_DELETE_TASKS_DAYS', 30)
         threshold = timezone.now() - timedelta(days=days)
@@ -425,9 +542,10 @@ def delete_old_error_logs():
 
         errors = Error.objects.filter(when__lte=threshold)
 
-        if errors.count() > 0:
-            logger.info('Deleting %s old error logs', errors.count())
-            errors.delete()
+        n = _batched_delete(errors)
+
+        if n:
+            logger.info('Deleted %s old error logs', n)
 
     except AppRegistryNotReady:  # pragma: no cover
         # Apps not yet loaded
@@ -473,6 +591,12 @@ def check_for_updates():
         logger.info("Could not perform 'check_for_updates' - App registry not ready")
         return
 
+    # Single-flight guard: with multiple worker processes the scheduled task
+    # can fire concurrently, and only one of them should poll GitHub
+    if not cache.add('lock:check_for_updates', '1', timeout=60):
+        logger.info("'check_for_updates' is already running - skipping")
+        return
+
     interval = int(
         get_global_setting('INVENTREE_UPDATE_CHECK_INTERVAL', 7, cache=False)
     )
@@ -492,38 +616,98 @@ def check_for_updates():
         if token:
             headers['Authorization'] = f'Bearer {token}'
 
-    response = requests.get(
+    # Provide cache validators from the previous successful request (if available).
+    # A "304 Not Modified" response carries no body and does not count
+    # against the GitHub API rate limit.
+    etag = get_global_setting('_INVENTREE_UPDATE_CHECK_ETAG', '', cache=False)
+    last_modified = get_global_setting(
+        '_INVENTREE_UPDATE_CHECK_LAST_MODIFIED', '', cache=False
+    )
+
+    if etag:
+        headers['If-None-Match'] = etag
+
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    # Separate connect / read timeouts, so a stalled connection cannot
+    # hold up the worker slot indefinitely
+    response = _github_session.get(
         'https://api.github.com/repos/inventree/inventree/releases/latest',
         headers=headers,
+        timeout=(3.05, 10),
     )
 
+    if response.status_code == 304:
+        # Release information has not changed - keep the saved version
+        logger.info('Latest InvenTree version is unchanged (304 Not Modified)')
+        record_task_success('check_for_updates')
+        return
+
+    if response.status_code == 403:  # pragma: no cover
+        # Most likely the GitHub API rate limit has been exceeded
+        logger.warning(
+            'GitHub API request rejected (403): %s requests remaining, limit resets at %s',
+            response.headers.get('X-RateLimit-Remaining', 'unknown'),
+            response.headers.get('X-RateLimit-Reset', 'unknown'),
+        )
+        return
+
     if response.status_code != 200:
         raise ValueError(
             f'Unexpected status code from GitHub API: {response.status_code}'
         )  # pragma: no cover
 
-    data = json.loads(response.text)
+    # Sanity check on the payload size before parsing -
+    # the release descriptor is expected to be (at most) a few kB
+    if int(response.headers.get('Content-Length', 0)) > 200_000:  # pragma: no cover
+        raise ValueError('Response from GitHub API too large')
+
+    # Save cache validators for the next update check
+    set_global_setting(
+        '_INVENTREE_UPDATE_CHECK_ETAG', response.headers.get('ETag', ''), None
+    )
+    set_global_setting(
+        '_INVENTREE_UPDATE_CHECK_LAST_MODIFIED',
+        response.headers.get('Last-Modified', ''),
+        None,
+    )
+
+    data = response.json()
 
     tag = data.get('tag_name', None)
 
     if not tag:
         raise ValueError("'tag_name' missing from GitHub response")  # pragma: no cover
 
-    match = re.match(r'^.*(\d+)\.(\d+)\.(\d+).*$', tag)
+    # Tag should be of the form 'major.minor.patch' (with an optional 'v' prefix)
+    parts = tag.lstrip('v').split('.')
 
-    if len(match.groups()) != 3:  # pragma: no cover
+    try:
+        # Validate the version components
+        # (the patch element may carry a pre-release suffix, e.g. '3-rc2')
+        _version = (int(parts[0]), int(parts[1]), int(parts[2].partition('-')[0]))
+    except (IndexError, ValueError):  # pragma: no cover
         logger.warning("Version '%s' did not match expected pattern", tag)
         return
 
-    latest_version = [int(x) for x in match.groups()]
+    logger.info("Latest InvenTree version: '%s'", tag)
 
-    if len(latest_version) != 3:
-        raise ValueError(f"Version '{tag}' is not correct format")  # pragma: no cover
+    # Save the version to the database.
+    # This is a *hidden* setting with no validation rules, so write the row
+    # directly rather than paying for the full set_setting machinery
+    from common.models import InvenTreeSetting
 
-    logger.info("Latest InvenTree version: '%s'", tag)
+    version_key = '_INVENTREE_LATEST_VERSION'
 
-    # Save the version to the database
-    set_global_setting('_INVENTREE_LATEST_VERSION', tag, None)
+    if not InvenTreeSetting.objects.filter(key__iexact=version_key).update(value=tag):
+        InvenTreeSetting.objects.create(key=version_key, value=tag)
+
+    # Invalidate any cached copy of the setting, as it was updated directly
+    try:
+        cache.delete(InvenTreeSetting.create_cache_key(version_key))
+    except Exception:  # pragma: no cover
+        pass
 
     # Record that this task was successful
     record_task_success('check_for_updates')
@@ -577,15 +761,25 @@ def update_exchange_rates(force: bool = False):
 
     backend = InvenTreeExchange()
     base = currency_code_default()
+
+    # Stable (sorted) tuple of the supported currency codes,
+    # so the generated SQL parameter list is deterministic between runs
+    codes = tuple(sorted(set(currency_codes())))
+
     logger.info("Updating exchange rates using base currency '%s'", base)
 
     try:
         backend.update_rates(base_currency=base)
 
         # Remove any exchange rates which are not in the provided currencies
-        Rate.objects.filter(backend='InvenTreeExchange').exclude(
-            currency__in=currency_codes()
-        ).delete()
+        with transaction.atomic():
+            stale_rates = Rate.objects.filter(backend='InvenTreeExchange').exclude(
+                currency__in=codes
+            )
+
+            # Raw delete - skips signal dispatch and ORM object construction
+            # (Rate rows have no FK cascades or delete signal handlers)
+            stale_rates._raw_delete(stale_rates.db)
 
         # Record successful task execution
         record_task_success('update_exchange_rates')
@@ -152,6 +152,7 @@ class Company(
         null=True,
         blank=True,
         variations={'thumbnail': (128, 128), 'preview': (256, 256)},
+        render_variations=InvenTree.helpers.render_image_variations_async,
         delete_orphans=True,
         verbose_name=_('Image'),
     )
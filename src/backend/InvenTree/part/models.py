@@ -295,7 +295,9 @@ class PartCategory(InvenTree.models.InvenTreeTree):
         else:
             queryset = PartCategoryStar.objects.filter(category=self)
 
-        for result in queryset:
+        # Fetch the related users in the same query,
+        # rather than one lookup per subscription entry
+        for result in queryset.select_related('user'):
             subscribers.add(result.user)
 
         return list(subscribers)
@@ -1078,6 +1080,7 @@ class Part(
         null=True,
         blank=True,
         variations={'thumbnail': (128, 128), 'preview': (256, 256)},
+        render_variations=InvenTree.helpers.render_image_variations_async,
         delete_orphans=False,
         verbose_name=_('Image'),
     )
@@ -1415,7 +1418,9 @@ class Part(
         else:
             queryset = queryset.filter(part=self)
 
-        for star in queryset:
+        # Fetch the related users in the same query,
+        # rather than one lookup per subscription entry
+        for star in queryset.select_related('user'):
             subscribers.add(star.user)
 
         if include_categories and self.category:
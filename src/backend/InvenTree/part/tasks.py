@@ -36,9 +36,12 @@ def notify_low_stock(part: part_models.Part):
     - A notification is delivered to any users who are 'subscribed' to this part
     """
     name = _('Low stock notification')
+
+    # Translate the static message template, then interpolate the part name,
+    # so that a stable (translatable) entry exists in the message catalog
     message = _(
-        f'The available stock for {part.name} has fallen below the configured minimum level'
-    )
+        'The available stock for {part} has fallen below the configured minimum level'
+    ).format(part=part.name)
     context = {
         'part': part,
         'name': name,